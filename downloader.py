@@ -1,10 +1,22 @@
 import os
 import time
+import atexit
 import logging
+import logging.handlers
+import queue
 import sqlite3
+import threading
+import io
 import json
+import random
+import signal
+import sys
 import requests
 import pprint
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError, RequestException
 
 # --------------------------
@@ -19,10 +31,16 @@ LOG_PATH = os.getenv("LOG_PATH", "./downloads/downloader.log")
 SLEEP_TIME = float(os.getenv("SLEEP_TIME", 1.0))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", 5))
 RATE_LIMIT_SLEEP = int(os.getenv("RATE_LIMIT_SLEEP", 30))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 3))
 FORCE_RECHECK = os.getenv("FORCE_RECHECK", "false").lower() == "true"
 PROGRESS_FILE = os.path.join(SAVE_DIR, "progress.json")
+PROGRESS_FLUSH_PAGES = 10  # write progress.json at most once per this many pages
 DOWNLOAD_SUBSCRIPTIONS = os.getenv("DOWNLOAD_SUBSCRIPTIONS", "false").lower() == "true"
 DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
+METADATA_BATCH_SIZE = 10  # max deviationids[] accepted by /deviation/metadata
+TAGGER_WORKERS = int(os.getenv("TAGGER_WORKERS", 4))
+ARTIST_WORKERS = int(os.getenv("ARTIST_WORKERS", 4))
+TAGGER_INLINE_MAX_BYTES = 4 * 1024 * 1024  # images up to this size are sent to the tagger from memory
 
 
 if not all([CLIENT_ID, CLIENT_SECRET, USERNAME]):
@@ -33,15 +51,35 @@ os.makedirs(SAVE_DIR, exist_ok=True)
 # --------------------------
 # Logging setup
 # --------------------------
+# Records are handed to a background listener so file writes never block the download loop
+log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+file_handler = logging.FileHandler(LOG_PATH, encoding="utf-8")
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# The QueueHandler passes the bare message through; the listener's handlers add the prefix
 logging.basicConfig(
     level=logging.DEBUG if DEBUG_MODE else logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_PATH, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 
+# --------------------------
+# HTTP session
+# --------------------------
+# One pooled session keeps TCP/TLS connections alive across API, image and tagger calls
+SESSION = requests.Session()
+adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0)
+SESSION.mount("https://", adapter)
+SESSION.mount("http://", adapter)
+SESSION.headers["User-Agent"] = "DeviantArt-Downloader/1.0 (+https://github.com/amissta200/DeviantArt-Downloader)"
+
 # --------------------------
 # Database setup
 # --------------------------
@@ -59,8 +97,37 @@ def add_is_premium_column_if_missing(conn):
             logging.error(f"❌ Unexpected error altering table: {e}")
             raise
 
+def tune_db(conn):
+    # WAL lets the skip-checks read while a page of inserts is being written,
+    # and NORMAL sync drops the per-commit fsync pair down to checkpoints.
+    if DB_PATH == ":memory:":
+        return
+    mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if mode.lower() != "wal":
+        logging.warning(f"⚠️ Could not enable WAL mode, journal_mode is '{mode}'")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+
+def close_db(conn):
+    try:
+        conn.execute("PRAGMA optimize")
+        conn.close()
+    except sqlite3.Error as e:
+        logging.warning(f"⚠️ Failed to close database cleanly: {e}")
+
+# deviationid -> is_premium, mirroring the downloads table so skip-checks avoid SQLite
+KNOWN = {}
+
+def load_known(conn):
+    KNOWN.clear()
+    KNOWN.update(conn.execute("SELECT deviationid, is_premium FROM downloads"))
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    # Artist workers share this connection, guarded by DB_LOCK
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+    tune_db(conn)
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS downloads (
@@ -75,40 +142,69 @@ def init_db():
     """)
     add_is_premium_column_if_missing(conn)
     conn.commit()
+    load_known(conn)
+    atexit.register(close_db, conn)
     return conn
 
 conn = init_db()
-
-def is_downloaded(deviation_id):
-    c = conn.cursor()
-    c.execute("SELECT 1 FROM downloads WHERE deviationid = ?", (deviation_id,))
-    return c.fetchone() is not None
-
-def mark_subscription(deviation_id, artist, title, url):
+DB_LOCK = threading.Lock()
+
+def lookup_downloads(deviation_ids):
+    """Return {deviationid: is_premium} for every id already in the downloads table."""
+    found = {d: KNOWN[d] for d in deviation_ids if d in KNOWN}
+    missing = [d for d in deviation_ids if d not in found]
+    if missing:
+        placeholders = ", ".join("?" * len(missing))
+        with DB_LOCK:
+            rows = conn.execute(
+                f"SELECT deviationid, is_premium FROM downloads WHERE deviationid IN ({placeholders})",
+                missing
+            ).fetchall()
+        for deviation_id, is_premium in rows:
+            KNOWN[deviation_id] = is_premium
+            found[deviation_id] = is_premium
+    return found
+
+# mark_* only run inside record_page, which holds DB_LOCK and the transaction
+def mark_subscriptions(rows):
     c = conn.cursor()
-    c.execute("""
-        INSERT OR IGNORE INTO downloads 
+    c.executemany("""
+        INSERT INTO downloads 
         (deviationid, artist, title, url, tags, is_premium)
         VALUES (?, ?, ?, ?, ?, 1)
-    """, (deviation_id, artist, title, url, ""))
-    conn.commit()
+        ON CONFLICT(deviationid) DO UPDATE SET is_premium = excluded.is_premium
+    """, [(deviation_id, artist, title, url, "") for deviation_id, artist, title, url in rows])
 
-def is_subscription(deviation_id):
-    c = conn.cursor()
-    c.execute(
-        "SELECT is_premium FROM downloads WHERE deviationid = ?",
-        (deviation_id,)
-    )
-    row = c.fetchone()
-    return row and row[0] == 1
-
-def mark_downloaded(deviation_id, artist, title, url, tags):
+def mark_downloaded(rows):
     c = conn.cursor()
-    c.execute("""
-        INSERT OR IGNORE INTO downloads (deviationid, artist, title, url, tags)
+    # Keeps is_premium on conflict, so subscription downloads stay flagged but gain their tags
+    c.executemany("""
+        INSERT INTO downloads (deviationid, artist, title, url, tags)
         VALUES (?, ?, ?, ?, ?)
-    """, (deviation_id, artist, title, url, "\n".join(tags)))
-    conn.commit()
+        ON CONFLICT(deviationid) DO UPDATE SET tags = excluded.tags
+    """, [
+        (deviation_id, artist, title, url, "\n".join(tags))
+        for deviation_id, artist, title, url, tags in rows
+    ])
+
+def record_page(subscriptions, downloads):
+    """Write one gallery page's rows in a single short transaction."""
+    # Rows are collected while the page downloads, so the write lock is only
+    # held for the inserts themselves and artists never wait on each other's I/O
+    with DB_LOCK:
+        conn.execute("BEGIN")
+        try:
+            mark_subscriptions(subscriptions)
+            mark_downloaded(downloads)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    for row in subscriptions:
+        KNOWN[row[0]] = 1
+    for row in downloads:
+        KNOWN.setdefault(row[0], 0)
 
 # --------------------------
 # Authentication
@@ -120,47 +216,145 @@ def get_access_token():
         "client_id": CLIENT_ID,
         "client_secret": CLIENT_SECRET
     }
-    r = requests.post(url, data=data)
+    # TokenManager calls this while holding its lock, so never let it hang
+    r = SESSION.post(url, data=data, timeout=20)
     r.raise_for_status()
-    token = r.json().get("access_token")
+    payload = r.json()
     logging.info("✅ Authenticated successfully.")
-    return token
+    return payload.get("access_token"), payload.get("expires_in", 3600)
+
+class TokenManager:
+    """Holds the OAuth token and refreshes it shortly before it expires."""
+
+    def __init__(self, refresh_margin=60):
+        self.refresh_margin = refresh_margin
+        self.token = None
+        self.expires_at = 0
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            if self.token is None or time.monotonic() >= self.expires_at:
+                self.token, expires_in = get_access_token()
+                self.expires_at = time.monotonic() + expires_in - self.refresh_margin
+            return self.token
+
+    def invalidate(self, token):
+        # Only drop the token that was rejected, so concurrent 401s refresh once
+        with self.lock:
+            if self.token == token:
+                self.token = None
+
+# --------------------------
+# Rate limiting
+# --------------------------
+class TokenBucket:
+    """Paces API calls to one per `interval` seconds, allowing short bursts of up to `burst`."""
+
+    def __init__(self, interval, burst):
+        # An interval of 0 or less means unthrottled, as SLEEP_TIME=0 always has
+        self.rate = 1 / interval if interval > 0 else None
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Hold back every caller for `seconds`, e.g. when the server says it's throttling us."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            # Start refilling from an empty bucket once the pause ends, so
+            # waiting workers resume at the steady rate instead of in a burst
+            self.tokens = min(self.tokens, 0)
+            self.updated = max(self.updated, self.paused_until)
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.paused_until)
+            if self.rate is None:
+                delay = start - now
+            else:
+                if start > self.updated:
+                    self.tokens = min(self.burst, self.tokens + (start - self.updated) * self.rate)
+                    self.updated = start
+                # Reserve a token now and sleep off exactly the deficit, if any
+                self.tokens -= 1
+                deficit = -self.tokens / self.rate if self.tokens < 0 else 0
+                delay = (self.updated - now) + deficit
+        if delay > 0:
+            time.sleep(delay)
+
+RATE_LIMITER = TokenBucket(interval=SLEEP_TIME, burst=RATE_LIMIT_BURST)
+
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds, accepting either seconds or an HTTP-date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+# Never below 1s, so retries still back off when SLEEP_TIME=0 disables pacing
+BACKOFF_BASE = max(SLEEP_TIME, 1.0)
+
+def backoff_time(retries):
+    # Full-jitter exponential backoff, capped at RATE_LIMIT_SLEEP
+    return random.uniform(0, min(RATE_LIMIT_SLEEP, BACKOFF_BASE * 2 ** retries))
 
 # --------------------------
 # Rate-limited GET with refresh
 # --------------------------
-def deviantart_get(url, token, params=None):
+def deviantart_get(url, tokens, params=None):
     retries = 0
     while retries < MAX_RETRIES:
-        headers = {"Authorization": f"Bearer {token}"}
+        RATE_LIMITER.acquire()
         try:
-            r = requests.get(url, headers=headers, params=params, timeout=20)
+            # The token only travels in this header and is re-read on every attempt;
+            # a failed refresh is retried like any other request error
+            token = tokens.get()
+            headers = {"Authorization": f"Bearer {token}"}
+            r = SESSION.get(url, headers=headers, params=params, timeout=20)
 
             if r.status_code == 429:
-                wait_time = RATE_LIMIT_SLEEP * (retries + 1)
-                logging.warning(f"⚠️ Rate limited: sleeping {wait_time}s")
-                time.sleep(wait_time)
+                wait_time = parse_retry_after(r.headers.get("Retry-After"))
+                if wait_time is None:
+                    wait_time = backoff_time(retries)
+                # The quota is shared, so every worker waits, not just this one
+                logging.warning(f"⚠️ Rate limited: pausing all requests for {wait_time:.1f}s")
+                RATE_LIMITER.pause(wait_time)
                 retries += 1
                 continue
 
             if r.status_code == 401:
-                logging.warning("🔄 Token expired — refreshing...")
-                token = get_access_token()   # refresh
+                logging.warning("🔄 Token rejected — refreshing...")
+                tokens.invalidate(token)
                 retries += 1
                 continue                     # retry with new token
 
             if not r.ok:
                 logging.error(f"❌ Request failed {r.status_code}: {r.text[:200]}")
+                retry_after = parse_retry_after(r.headers.get("Retry-After"))
+                if retry_after is not None:
+                    RATE_LIMITER.pause(retry_after)
+                else:
+                    time.sleep(backoff_time(retries))
                 retries += 1
-                time.sleep(SLEEP_TIME)
                 continue
 
             return r.json()
 
         except (HTTPError, RequestException) as e:
             logging.error(f"Request exception {e}")
+            time.sleep(backoff_time(retries))
             retries += 1
-            time.sleep(SLEEP_TIME)
 
     raise RuntimeError(f"Failed after {MAX_RETRIES} retries: {url}")
 
@@ -178,70 +372,186 @@ def load_progress():
         logging.warning(f"⚠️ Failed to load progress file: {e}")
         return {"last_artist_index": 0, "last_offset": 0}
 
-def save_progress(last_artist_index, last_offset):
-    data = {"last_artist_index": last_artist_index, "last_offset": last_offset}
-    try:
-        with open(PROGRESS_FILE, "w") as f:
-            json.dump(data, f)
-    except Exception as e:
-        logging.warning(f"⚠️ Failed to save progress file: {e}")
+# Latest checkpoint held in memory until it is flushed to disk. With several
+# artists in flight the checkpoint is the lowest artist that hasn't finished,
+# at the last offset committed for it.
+progress_state = {"pending": None, "pages": 0, "next_index": 0, "offsets": {}, "finished": set()}
+PROGRESS_LOCK = threading.RLock()
+SHUTDOWN = threading.Event()
+
+def start_progress(artist_index, offset):
+    with PROGRESS_LOCK:
+        progress_state["next_index"] = artist_index
+        progress_state["offsets"] = {artist_index: offset}
+        progress_state["finished"] = set()
+
+def save_progress(artist_index, offset):
+    with PROGRESS_LOCK:
+        progress_state["offsets"][artist_index] = offset
+        update_checkpoint()
+
+def finish_progress(artist_index):
+    with PROGRESS_LOCK:
+        progress_state["finished"].add(artist_index)
+        progress_state["offsets"].pop(artist_index, None)
+        update_checkpoint()
+
+def update_checkpoint():
+    # Caller holds PROGRESS_LOCK
+    next_index = progress_state["next_index"]
+    while next_index in progress_state["finished"]:
+        progress_state["finished"].discard(next_index)
+        next_index += 1
+    progress_state["next_index"] = next_index
+
+    progress_state["pending"] = {
+        "last_artist_index": next_index,
+        "last_offset": progress_state["offsets"].get(next_index, 0)
+    }
+    progress_state["pages"] += 1
+    if progress_state["pages"] >= PROGRESS_FLUSH_PAGES:
+        flush_progress()
+
+def reset_progress():
+    with PROGRESS_LOCK:
+        progress_state["pending"] = {"last_artist_index": 0, "last_offset": 0}
+        flush_progress()
+
+def flush_progress():
+    with PROGRESS_LOCK:
+        data = progress_state["pending"]
+        if data is None:
+            return
+        # Write to a temp file and swap it in so a crash never leaves a half-written checkpoint
+        tmp_path = PROGRESS_FILE + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, PROGRESS_FILE)
+            progress_state["pending"] = None
+            progress_state["pages"] = 0
+        except Exception as e:
+            logging.warning(f"⚠️ Failed to save progress file: {e}")
+
+def handle_shutdown(signum, frame):
+    logging.info(f"🛑 Received {signal.Signals(signum).name}, saving progress and stopping after the current pages")
+    SHUTDOWN.set()
+    # Write the checkpoint now: draining in-flight pages can outlast a container's stop timeout
+    flush_progress()
+    # SystemExit unwinds main normally, and atexit flushes whatever workers record while draining
+    sys.exit(0)
 
 # --------------------------
 # Fetch followed artists
 # --------------------------
-def get_followed_artists(token):
+def get_followed_artists(tokens):
     url = f"https://www.deviantart.com/api/v1/oauth2/user/friends/{USERNAME}"
     offset = 0
     artists = []
 
     logging.info(f"📜 Fetching followed artists for {USERNAME}...")
     while True:
-        params = {"access_token": token, "offset": offset, "limit": 24}
-        data = deviantart_get(url, token, params)
+        params = {"offset": offset, "limit": 24}
+        data = deviantart_get(url, tokens, params)
         batch = [f['user']['username'] for f in data.get('results', [])]
         artists.extend(batch)
         logging.info(f"Fetched {len(batch)} artists (total {len(artists)})")
         if not data.get('has_more'):
             break
         offset = data.get('next_offset', 0)
-        time.sleep(SLEEP_TIME)
     return artists
 
+# --------------------------
+# Image streaming
+# --------------------------
+def stream_to_file(response, path, chunk_size=64 * 1024):
+    """Write a streamed response to path, returning its bytes if small enough to keep."""
+    buffer = io.BytesIO()
+    response.raw.decode_content = True
+    with open(path, "wb") as f:
+        while True:
+            chunk = response.raw.read(chunk_size)
+            if not chunk:
+                break
+            f.write(chunk)
+            if buffer is not None:
+                buffer.write(chunk)
+                if buffer.tell() > TAGGER_INLINE_MAX_BYTES:
+                    buffer = None
+    return buffer.getvalue() if buffer is not None else None
+
+# --------------------------
+# Subscription detection
+# --------------------------
+def is_subscription_content(deviation: dict) -> bool:
+    # ---- Legacy DA premium system ----
+    premium_data = deviation.get("premium_folder_data")
+    if premium_data is not None and premium_data.get("type") == "paid":
+        return True
+
+    # ---- Modern DA access control ----
+    # Field only exists when gating is active
+    if "tier_access" in deviation:
+        return True
+
+    # ---- Tier system presence ----
+    if "primary_tier" in deviation:
+        return True
+
+    return False
+
+def should_download(deviation: dict) -> bool:
+    """Whether a new deviation gets its metadata, image and tags fetched."""
+    if not is_subscription_content(deviation):
+        return True
+    # Subscription content only when explicitly enabled, and locked items
+    # come without an image source, so there is nothing to fetch or tag
+    return DOWNLOAD_SUBSCRIPTIONS and bool(deviation.get("content", {}).get("src"))
+
+# --------------------------
+# Fetch tags
+# --------------------------
+def fetch_tags(tokens, deviation_ids):
+    """Fetch tags for many deviations, METADATA_BATCH_SIZE ids per metadata call."""
+    meta_url = "https://www.deviantart.com/api/v1/oauth2/deviation/metadata"
+    tags_by_id = {}
+
+    for i in range(0, len(deviation_ids), METADATA_BATCH_SIZE):
+        chunk = deviation_ids[i:i + METADATA_BATCH_SIZE]
+        params = {
+            "deviationids[]": chunk,
+            "mature_content": "true"
+        }
+
+        try:
+            metadata = deviantart_get(meta_url, tokens, params)
+        except Exception as e:
+            logging.error(f"❌ Failed to get metadata for {', '.join(chunk)}: {e}")
+            continue
+
+        for item in metadata.get("metadata", []):
+            tags_by_id[item["deviationid"]] = [t["tag_name"] for t in item.get("tags", [])]
+
+    return tags_by_id
+
 # --------------------------
 # Save deviation
 # --------------------------
-def save_deviation(token, artist, deviation):
+def save_deviation(tokens, artist, artist_dir, deviation, tagger_pool, known_state, tags, subscriptions):
     deviation_id = deviation["deviationid"]
     title = deviation.get("title", "untitled")
     content = deviation.get("content", {})
     url = deviation.get("url")
 
     # Known subscription → always skip first
-    if is_subscription(deviation_id):
+    if known_state == 1:
         logging.debug(f"⏩ Known subscription content skipped: {title} ({deviation_id})")
         return
 
     # Skip already downloaded normal content
-    if is_downloaded(deviation_id):
+    if known_state is not None:
         logging.debug(f"⏩ Skipping already downloaded {deviation_id}")
         return
-        
-    def is_subscription_content(deviation: dict) -> bool:
-        # ---- Legacy DA premium system ----
-        premium_data = deviation.get("premium_folder_data")
-        if premium_data is not None and premium_data.get("type") == "paid":
-            return True
-
-        # ---- Modern DA access control ----
-        # Field only exists when gating is active
-        if "tier_access" in deviation:
-            return True
-
-        # ---- Tier system presence ----
-        if "primary_tier" in deviation:
-            return True
-
-        return False
 
     is_premium = is_subscription_content(deviation)
 
@@ -251,46 +561,23 @@ def save_deviation(token, artist, deviation):
             logging.debug(pprint.pformat(deviation))
 
         # Always flag in DB
-        mark_subscription(deviation_id, artist, title, url)
+        subscriptions.append((deviation_id, artist, title, url))
 
-        # Only download if explicitly enabled
-        if not DOWNLOAD_SUBSCRIPTIONS:
-            return
+    if not should_download(deviation):
+        logging.debug(f"⏩ Not downloading subscription content: {title} ({deviation_id})")
+        return
 
+    if is_premium:
         logging.warning(f"⚠️ DOWNLOAD_SUBSCRIPTIONS enabled — attempting download anyway")
 
-
-    # Fetch metadata for tags
-    meta_url = "https://www.deviantart.com/api/v1/oauth2/deviation/metadata"
-    params = {
-        "access_token": token,
-        "deviationids[]": deviation_id,
-        "mature_content": "true"
-    }
-
-    try:
-        metadata = deviantart_get(meta_url, token, params)
-    except Exception as e:
-        logging.error(f"❌ Failed to get metadata for {deviation_id}: {e}")
-        metadata = {}
-
-    tags = []
-    if "metadata" in metadata and len(metadata["metadata"]) > 0:
-        tags = [t["tag_name"] for t in metadata["metadata"][0].get("tags", [])]
-
-    artist_dir = os.path.join(SAVE_DIR, artist)
-    os.makedirs(artist_dir, exist_ok=True)
-
     txt_path = os.path.join(artist_dir, f"{deviation_id}.txt")
     img_path = os.path.join(artist_dir, f"{deviation_id}.jpg")
 
     with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(f"title: {title}\n")
-        f.write(f"artist: {artist}\n")
-        f.write(f"url: {url}\n\n")
-        f.write("\n".join(tags) + "\n")
+        f.write(f"title: {title}\nartist: {artist}\nurl: {url}\n\n" + "\n".join(tags) + "\n")
 
     # Save image
+    img_data = None
     try:
         is_mature = deviation.get("is_mature", False)
 
@@ -298,9 +585,7 @@ def save_deviation(token, artist, deviation):
             logging.debug(f"🔞 Mature content — resolving download URL for {deviation_id}")
 
             download_api = f"https://www.deviantart.com/api/v1/oauth2/deviation/download/{deviation_id}"
-            params = {"access_token": token}
-
-            download_data = deviantart_get(download_api, token, params)
+            download_data = deviantart_get(download_api, tokens)
 
             # If API failed or limit hit
             if not download_data or "src" not in download_data:
@@ -308,8 +593,7 @@ def save_deviation(token, artist, deviation):
                 logging.warning(f"⚠️ Download API failed for {deviation_id}: {error_msg}")
                 return
 
-            real_url = download_data["src"]
-            img = requests.get(real_url, timeout=20)
+            image_url = download_data["src"]
 
         else:
             logging.debug(f"🖼️ Normal content — using content[src] for {deviation_id}")
@@ -318,24 +602,56 @@ def save_deviation(token, artist, deviation):
                 logging.warning(f"⚠️ No content[src] for {deviation_id}")
                 return
 
-            img = requests.get(content["src"], timeout=20)
-
-        img.raise_for_status()
+            image_url = content["src"]
 
-        with open(img_path, "wb") as f:
-            f.write(img.content)
+        # Stream straight to disk, keeping small images around for the tagger
+        with SESSION.get(image_url, stream=True, timeout=60) as img:
+            img.raise_for_status()
+            img_data = stream_to_file(img, img_path)
 
     except Exception as e:
         logging.warning(f"⚠️ Failed to download image {title}: {e}")
+        # Don't leave a truncated image behind if the stream broke mid-way
+        if os.path.exists(img_path):
+            os.remove(img_path)
 
+    # Tagging runs in the background so the next deviation can start fetching,
+    # but waits for a free slot so buffered images don't pile up in memory
+    TAGGER_SLOTS.acquire()
     try:
-        with open(img_path, "rb") as img_file:
-            response = requests.post(
+        future = tagger_pool.submit(
+            append_ai_tags, deviation_id, artist, title, url, tags, txt_path, img_path, img_data
+        )
+    except Exception:
+        TAGGER_SLOTS.release()
+        raise
+    future.add_done_callback(lambda _: TAGGER_SLOTS.release())
+    return future
+
+
+# --------------------------
+# AI tagging
+# --------------------------
+# Caps queued plus running tagger jobs, each of which may hold an in-memory image copy
+TAGGER_SLOTS = threading.BoundedSemaphore(TAGGER_WORKERS * 2)
+
+def append_ai_tags(deviation_id, artist, title, url, tags, txt_path, img_path, img_data):
+    try:
+        if img_data is not None:
+            response = SESSION.post(
                 "http://autotagger-deviantart:5000/evaluate",
-                files={"file": img_file},
+                files={"file": (os.path.basename(img_path), img_data)},
                 data={"format": "json"},
                 timeout=60
             )
+        else:
+            with open(img_path, "rb") as img_file:
+                response = SESSION.post(
+                    "http://autotagger-deviantart:5000/evaluate",
+                    files={"file": img_file},
+                    data={"format": "json"},
+                    timeout=60
+                )
 
         response.raise_for_status()
         tagger_output = response.json()
@@ -348,64 +664,124 @@ def save_deviation(token, artist, deviation):
         # Append tags to existing txt
         if ai_tags:
             with open(txt_path, "a", encoding="utf-8") as f:
-                f.write("\n# AI tags\n")
-                f.write("\n".join(ai_tags) + "\n")
+                f.write("\n# AI tags\n" + "\n".join(ai_tags) + "\n")
 
     except Exception as e:
         logging.warning(f"⚠️ Tagger failed for {img_path}: {e}")
 
-    mark_downloaded(deviation_id, artist, title, url, tags)
     logging.info(f"✅ Saved {deviation_id} ({title}) for {artist} ({len(tags)} tags)")
+    return deviation_id, artist, title, url, tags
 
 
 # --------------------------
-# Main
+# Process artist
 # --------------------------
-def main():
-    token = get_access_token()
-    artists = get_followed_artists(token)
-    logging.info(f"Found {len(artists)} artists")
+def process_artist(tokens, idx, total, artist, start_offset, tagger_pool, page_pool):
+    logging.info(f"🎨 Processing artist ({idx + 1}/{total}): {artist}")
 
-    progress = load_progress()
-    start_artist_idx = progress.get("last_artist_index", 0)
-    start_offset = progress.get("last_offset", 0)
+    try:
+        artist_dir = os.path.join(SAVE_DIR, artist)
+        os.makedirs(artist_dir, exist_ok=True)
 
-    for idx, artist in enumerate(artists[start_artist_idx:], start=start_artist_idx):
-        logging.info(f"🎨 Processing artist ({idx + 1}/{len(artists)}): {artist}")
+        url = "https://www.deviantart.com/api/v1/oauth2/gallery/all"
+        has_more = True
+        current_offset = start_offset
 
-        try:
-            # Use start_offset only for first artist after resuming
-            offset_to_use = start_offset if idx == start_artist_idx else 0
-            url = "https://www.deviantart.com/api/v1/oauth2/gallery/all"
-            has_more = True
-            current_offset = offset_to_use
+        params = {"username": artist, "offset": current_offset, "limit": 24}
+        data = deviantart_get(url, tokens, params)
 
-            while has_more:
-                params = {"username": artist, "access_token": token, "offset": current_offset, "limit": 24}
-                data = deviantart_get(url, token, params)
-                results = data.get("results", [])
-                if not results:
-                    logging.info(f"⚠️ No gallery results for {artist} at offset {current_offset}.")
-                    break
+        while has_more:
+            if SHUTDOWN.is_set():
+                return
 
-                for deviation in results:
-                    save_deviation(token, artist, deviation)
-                    time.sleep(SLEEP_TIME)
+            results = data.get("results", [])
+            if not results:
+                logging.info(f"⚠️ No gallery results for {artist} at offset {current_offset}.")
+                break
 
-                has_more = data.get("has_more", False)
-                current_offset = data.get("next_offset", 0)
+            has_more = data.get("has_more", False)
+            current_offset = data.get("next_offset", 0)
 
-                # Save progress after each page of deviations for this artist
-                save_progress(idx, current_offset)
+            # Fetch the next page while this one is downloading
+            if has_more:
+                params = {"username": artist, "offset": current_offset, "limit": 24}
+                next_page = page_pool.submit(deviantart_get, url, tokens, params)
 
-            # Reset offset for next artist
-            start_offset = 0
+            known = lookup_downloads([d["deviationid"] for d in results])
 
-        except Exception as e:
-            logging.error(f"❌ Error with {artist}: {e}")
+            # Tags for every deviation on this page that will actually be downloaded
+            to_download = [
+                d["deviationid"] for d in results
+                if d["deviationid"] not in known and should_download(d)
+            ]
+            tags_by_id = fetch_tags(tokens, to_download)
+
+            subscriptions = []
+            pending = []
+            for deviation in results:
+                deviation_id = deviation["deviationid"]
+                future = save_deviation(
+                    tokens, artist, artist_dir, deviation, tagger_pool,
+                    known.get(deviation_id), tags_by_id.get(deviation_id, []), subscriptions
+                )
+                if future is not None:
+                    pending.append(future)
+
+            # One transaction per page instead of one commit per deviation
+            record_page(subscriptions, [future.result() for future in pending])
+
+            # Save progress after each page of deviations for this artist
+            save_progress(idx, current_offset)
+
+            if has_more:
+                data = next_page.result()
+
+    except Exception as e:
+        logging.error(f"❌ Error with {artist}: {e}")
+
+    finish_progress(idx)
+
+
+# --------------------------
+# Main
+# --------------------------
+def main():
+    atexit.register(flush_progress)
+    signal.signal(signal.SIGINT, handle_shutdown)
+    signal.signal(signal.SIGTERM, handle_shutdown)
+
+    tokens = TokenManager()
+    artists = get_followed_artists(tokens)
+    logging.info(f"Found {len(artists)} artists")
+
+    progress = load_progress()
+    start_artist_idx = progress.get("last_artist_index", 0)
+    start_offset = progress.get("last_offset", 0)
+    start_progress(start_artist_idx, start_offset)
+
+    # Artists run in parallel; the token bucket, session and DB lock are shared
+    artist_pool = ThreadPoolExecutor(max_workers=ARTIST_WORKERS)
+    tagger_pool = ThreadPoolExecutor(max_workers=TAGGER_WORKERS)
+    page_pool = ThreadPoolExecutor(max_workers=ARTIST_WORKERS)
+
+    try:
+        futures = [
+            artist_pool.submit(
+                process_artist, tokens, idx, len(artists), artist,
+                # Use start_offset only for first artist after resuming
+                start_offset if idx == start_artist_idx else 0,
+                tagger_pool, page_pool
+            )
+            for idx, artist in enumerate(artists[start_artist_idx:], start=start_artist_idx)
+        ]
+        wait(futures)
+    finally:
+        artist_pool.shutdown(cancel_futures=True)
+        tagger_pool.shutdown()
+        page_pool.shutdown()
 
     # Finished all artists, reset progress
-    save_progress(0, 0)
+    reset_progress()
 
 if __name__ == "__main__":
     main()